@@ -15,9 +15,9 @@ class Config:
  
     LLM_MODEL = "openai:gpt-4o"
     
-    # Document Processing
-    CHUNK_SIZE = 500
-    CHUNK_OVERLAP = 50
+    # Document Processing (sizes in tokens)
+    CHUNK_SIZE = 400
+    CHUNK_OVERLAP = 40
     
     # Default URLs
     DEFAULT_URLS = [
@@ -1,32 +1,275 @@
 """Document processing module for loading and splitting documents."""
 
+import asyncio
+import codecs
+import hashlib
+import mmap
+import os
+import queue
+import re
+import threading
+from collections import OrderedDict, deque
+from functools import lru_cache, partial
+from itertools import islice
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, closing
 from pathlib import Path
-from typing import List, Sequence, Union
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 from urllib.parse import urlparse
 
+import tiktoken
 from langchain_community.document_loaders import (
     WebBaseLoader,
-    TextLoader,
-    PyPDFDirectoryLoader,
+    PyMuPDFLoader,
 )
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+# Chunks are measured with this model's tokenizer, matching what embedding bills.
+TOKENIZER_MODEL = "text-embedding-3-small"
+SEPARATORS = ["\n\n", "\n", ". ", " ", ""]
+
+# Bytes of a text file decoded per step when streaming it.
+TEXT_BLOCK_SIZE = 1 << 20
+# Longest segment held back waiting for a line break before it is cut between words.
+TEXT_SEGMENT_MAX_CHARS = 4 * TEXT_BLOCK_SIZE
+
+# Local sources read concurrently ahead of the one being yielded, and the
+# documents each may buffer before its reader waits for the consumer.
+LOCAL_SOURCE_PREFETCH = 4
+SOURCE_BUFFER_DOCS = 16
+
+# Page breaks and vertical tabs become newlines; byte-order marks are dropped.
+_CONTROL_CHARS = str.maketrans({"\f": "\n", "\v": "\n", "\ufeff": None})
+_HORIZONTAL_WHITESPACE = re.compile(r"[ \t]+")
+
+# lxml (libxml2) parses HTML much faster and with less memory than html.parser.
+_WEB_LOADER_KWARGS = {
+    "default_parser": "lxml",
+    "bs_get_text_kwargs": {"separator": " ", "strip": True},
+    "requests_per_second": 4,
+}
+
+
+class _DocumentCache:
+    """Thread-safe LRU cache of loaded or split documents.
+
+    Entries are bounded both in number and in total page-content size,
+    measured in characters; metadata is not counted. A single entry larger
+    than the size bound is not cached at all.
+    """
+
+    def __init__(self, maxsize: int = 512, max_chars: int = 64 * 1024 * 1024) -> None:
+        self.maxsize = maxsize
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[Document, ...], int]]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[List[Document]]:
+        """Return copies of the cached documents for `key`, or None on a miss."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+            self._entries.move_to_end(key)
+        # Deep copies, so callers cannot mutate the cached metadata either.
+        return [doc.model_copy(deep=True) for doc in cached[0]]
+
+    def put(self, key: Hashable, docs: Sequence[Document]) -> None:
+        """Store `docs` under `key`, evicting least recently used entries."""
+        chars = sum(len(doc.page_content) for doc in docs)
+        if chars > self.max_chars:
+            return
+
+        entry = tuple(doc.model_copy(deep=True) for doc in docs)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._chars -= previous[1]
+            self._entries[key] = (entry, chars)
+            self._chars += chars
+            while len(self._entries) > self.maxsize or self._chars > self.max_chars:
+                _, (_, evicted_chars) = self._entries.popitem(last=False)
+                self._chars -= evicted_chars
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+
+_load_cache = _DocumentCache(maxsize=512)
+_split_cache = _DocumentCache(maxsize=512)
+
+_DONE = object()
+
+
+class _SourcePrefetcher:
+    """Read a document stream on a worker thread into a small bounded buffer.
+
+    The reader blocks once `SOURCE_BUFFER_DOCS` documents are waiting, so
+    a source is read ahead without being materialized. Errors are re-raised
+    to the consumer once it has drained the documents read before them.
+    """
+
+    def __init__(
+        self, executor: ThreadPoolExecutor, produce: Callable[[], Iterator[Document]]
+    ) -> None:
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=SOURCE_BUFFER_DOCS)
+        self._stopped = threading.Event()
+        self._future = executor.submit(self._read, produce)
+
+    def _read(self, produce: Callable[[], Iterator[Document]]) -> None:
+        try:
+            with closing(produce()) as docs:
+                for doc in docs:
+                    if not self._put(doc):
+                        return
+        finally:
+            self._put(_DONE)
+
+    def _put(self, item: object) -> bool:
+        """Buffer `item`, giving up if the consumer went away."""
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self) -> Iterator[Document]:
+        while (item := self._queue.get()) is not _DONE:
+            yield item
+        self._future.result()
+
+    def stop(self) -> None:
+        """Let the reader exit without waiting for its buffer to drain."""
+        self._stopped.set()
+
+
+def _file_cache_key(file_path: Path) -> Tuple[str, int, int]:
+    """Key a file on its resolved path, modification time and size."""
+    stat = file_path.stat()
+    return str(file_path.resolve()), stat.st_mtime_ns, stat.st_size
+
+
+def _documents_digest(documents: Sequence[Document]) -> str:
+    """Hash the content and metadata of `documents` for cache lookups."""
+    digest = hashlib.blake2b(digest_size=16)
+    for doc in documents:
+        digest.update(doc.page_content.encode("utf-8", "surrogatepass"))
+        digest.update(b"\x00")
+        digest.update(repr(sorted(doc.metadata.items())).encode("utf-8", "surrogatepass"))
+        digest.update(b"\x01")
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> tiktoken.Encoding:
+    """Return the tokenizer for `TOKENIZER_MODEL`, loaded once per process."""
+    return tiktoken.encoding_for_model(TOKENIZER_MODEL)
+
+
+def _token_length(text: str) -> int:
+    """Count tokens the way the embeddings API does, ignoring special tokens."""
+    return len(_encoding().encode_ordinary(text))
+
+
+@lru_cache(maxsize=None)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """Return a shared token-aware splitter for the given chunk settings.
+
+    Splitters are stateless, so one instance is reused across every
+    `DocumentProcessor` with the same configuration.
+    """
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=_token_length,
+        separators=SEPARATORS,
+    )
+
+
+def _clean_documents(documents: List[Document]) -> List[Document]:
+    """Strip control characters and collapse runs of spaces in place.
+
+    Page breaks, vertical tabs and byte-order marks otherwise reach the
+    splitter and inflate token counts without carrying any content.
+    """
+    for doc in documents:
+        doc.page_content = _HORIZONTAL_WHITESPACE.sub(
+            " ", doc.page_content.translate(_CONTROL_CHARS)
+        )
+    return documents
+
+
+def _run_coroutine(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine to completion from synchronous code.
+
+    `asyncio.run` refuses to start while an event loop is already running
+    in this thread (Jupyter, async callers), so in that case the coroutine
+    runs on a fresh loop in a helper thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def _load_pdf_file(file_path: Path) -> List[Document]:
+    """Load and clean a single PDF with PyMuPDF, one `Document` per page.
+
+    Defined at module level so it can be dispatched to worker processes.
+    """
+    return _clean_documents(PyMuPDFLoader(str(file_path)).load())
+
 
 class DocumentProcessor:
-    def __init__(self, chunk_size: int = 500, chunk_overlap: int = 100) -> None:
+    def __init__(self, chunk_size: int = 400, chunk_overlap: int = 40) -> None:
         """Initialize DocumentProcessor.
 
         Args:
-            chunk_size: Size of text chunks. Defaults to 500.
-            chunk_overlap: Overlap between chunks. Defaults to 100.
+            chunk_size: Size of text chunks in tokens. Defaults to 400.
+            chunk_overlap: Overlap between chunks in tokens. Defaults to 40.
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-        )
+        self.splitter = _get_splitter(self.chunk_size, self.chunk_overlap)
+
+    @staticmethod
+    def _validate_url(url: str) -> None:
+        """Ensure `url` is a non-empty HTTP or HTTPS URL.
+
+        Raises:
+            ValueError: If the URL is empty or uses an unsupported scheme.
+        """
+        if not url:
+            raise ValueError("Parameter 'url' must be a non-empty string.")
+
+        parsed = urlparse(url)
+        if parsed.scheme not in {"http", "https"}:
+            raise ValueError(
+                f"Unsupported URL scheme {parsed.scheme!r}. Only 'http' and 'https' are allowed."
+            )
 
     def load_from_url(self, url: str) -> List[Document]:
         """Load documents from a given URL.
@@ -41,19 +284,12 @@ class DocumentProcessor:
             ValueError: If the URL is empty or uses an unsupported scheme.
             RuntimeError: If loading the document(s) fails.
         """
-        if not url:
-            raise ValueError("Parameter 'url' must be a non-empty string.")
+        self._validate_url(url)
 
-        parsed = urlparse(url)
-        if parsed.scheme not in {"http", "https"}:
-            raise ValueError(
-                f"Unsupported URL scheme {parsed.scheme!r}. Only 'http' and 'https' are allowed."
-            )
-
-        loader = WebBaseLoader(url)
+        loader = WebBaseLoader(url, **_WEB_LOADER_KWARGS)
 
         try:
-            return loader.load()
+            return _clean_documents(loader.load())
         except Exception as exc:
             raise RuntimeError(f"Failed to load documents from URL: {url!r}") from exc
 
@@ -70,6 +306,39 @@ class DocumentProcessor:
             ValueError: If the directory path is invalid or does not exist.
             RuntimeError: If loading the document(s) fails.
         """
+        directory = self._validate_pdf_dir(directory)
+        pdf_files = sorted(directory.glob("*.pdf"))
+        return list(self._iter_pdf_files(directory, pdf_files, cache=True))
+
+    def iter_pdf_docs(self, directory: Union[str, Path]) -> Iterator[Document]:
+        """Lazily load all PDFs within a directory.
+
+        Documents are yielded file by file in sorted order, and only one
+        file per worker process is parsed ahead of the consumer, so callers
+        can process a large directory without holding every page in memory.
+        Streamed files bypass the load cache. The directory is validated
+        eagerly, before the iterator is returned.
+
+        Args:
+            directory: Path of the directory.
+
+        Returns:
+            An iterator over loaded `Document` instances.
+
+        Raises:
+            ValueError: If the directory path is invalid or does not exist.
+            RuntimeError: If loading the document(s) fails (raised while iterating).
+        """
+        directory = self._validate_pdf_dir(directory)
+        return self._iter_pdf_files(directory, sorted(directory.glob("*.pdf")))
+
+    @staticmethod
+    def _validate_pdf_dir(directory: Union[str, Path]) -> Path:
+        """Ensure `directory` points to an existing directory.
+
+        Raises:
+            ValueError: If the directory path is invalid or does not exist.
+        """
         if not directory:
             raise ValueError("Parameter 'directory' must be a non-empty string or Path.")
 
@@ -81,14 +350,56 @@ class DocumentProcessor:
         if not directory.is_dir():
             raise ValueError(f"Provided path is not a directory: {directory}")
 
-        loader = PyPDFDirectoryLoader(path=directory)
+        return directory
 
-        try:
-            return loader.load()
-        except Exception as exc:
-            raise RuntimeError(
-                f"Failed to load PDF documents from directory: {directory!r}"
-            ) from exc
+    def _iter_pdf_files(
+        self, directory: Path, pdf_files: List[Path], cache: bool = False
+    ) -> Iterator[Document]:
+        """Yield the documents of `pdf_files`, parsing them in worker processes.
+
+        At most one file per worker is submitted ahead of the file being
+        yielded. With `cache`, files are looked up in and added to the load cache.
+        """
+        workers = min(len(pdf_files), os.cpu_count() or 1)
+
+        with ExitStack() as stack:
+            executor: Optional[ProcessPoolExecutor] = None
+            if workers > 1:
+                # Text extraction is CPU-bound, so spread files across processes.
+                executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+
+            def schedule(
+                pdf_file: Path,
+            ) -> Tuple[Path, Optional[Hashable], Union[List[Document], Future, None]]:
+                key = _file_cache_key(pdf_file) if cache else None
+                file_docs = _load_cache.get(key) if cache else None
+                if file_docs is None and executor is not None:
+                    file_docs = executor.submit(_load_pdf_file, pdf_file)
+                return pdf_file, key, file_docs
+
+            remaining = iter(pdf_files)
+            window = deque(schedule(pdf_file) for pdf_file in islice(remaining, workers))
+
+            while window:
+                pdf_file, key, file_docs = window.popleft()
+                next_file = next(remaining, None)
+                if next_file is not None:
+                    window.append(schedule(next_file))
+
+                if not isinstance(file_docs, list):
+                    try:
+                        if file_docs is not None:
+                            file_docs = file_docs.result()
+                        else:
+                            file_docs = _load_pdf_file(pdf_file)
+                    except Exception as exc:
+                        raise RuntimeError(
+                            f"Failed to load PDF documents from directory: {directory!r}"
+                        ) from exc
+                    if cache:
+                        _load_cache.put(key, file_docs)
+
+                yield from file_docs
 
     def load_from_txt(self, file_path: Union[str, Path]) -> List[Document]:
         """Load document(s) from a text file.
@@ -103,6 +414,44 @@ class DocumentProcessor:
             ValueError: If the path is invalid or does not exist.
             RuntimeError: If loading the document(s) fails.
         """
+        file_path = self._validate_txt_path(file_path)
+
+        key = _file_cache_key(file_path)
+        cached = _load_cache.get(key)
+        if cached is not None:
+            return cached
+
+        docs = list(self._iter_text_segments(file_path))
+        _load_cache.put(key, docs)
+        return docs
+
+    def iter_txt_docs(self, file_path: Union[str, Path]) -> Iterator[Document]:
+        """Lazily load a text file as a sequence of segment documents.
+
+        The file is memory-mapped and decoded `TEXT_BLOCK_SIZE` bytes at a
+        time. Each segment ends at a paragraph or line break, so peak
+        memory stays at a few blocks however large the file is. The path is
+        validated eagerly, before the iterator is returned.
+
+        Args:
+            file_path: Path of the file.
+
+        Returns:
+            An iterator over loaded `Document` instances.
+
+        Raises:
+            ValueError: If the path is invalid or does not exist.
+            RuntimeError: If loading the document(s) fails (raised while iterating).
+        """
+        return self._iter_text_segments(self._validate_txt_path(file_path))
+
+    @staticmethod
+    def _validate_txt_path(file_path: Union[str, Path]) -> Path:
+        """Ensure `file_path` points to an existing `.txt` file.
+
+        Raises:
+            ValueError: If the path is invalid or does not exist.
+        """
         if not file_path:
             raise ValueError("Parameter 'file_path' must be a non-empty string or Path.")
 
@@ -119,16 +468,93 @@ class DocumentProcessor:
                 f"(expected '.txt')."
                 )
 
-      
-        loader = TextLoader(str(file_path))
+        return file_path
+
+    def _iter_text_segments(self, file_path: Path) -> Iterator[Document]:
+        """Yield cleaned segments of a UTF-8 text file read through mmap."""
+        source = str(file_path)
 
         try:
-            return loader.load()
-        except Exception as exc:
+            with open(file_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    yield Document(page_content="", metadata={"source": source})
+                    return
+
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    decoder = codecs.getincrementaldecoder("utf-8")()
+                    pending = ""
+
+                    for start in range(0, size, TEXT_BLOCK_SIZE):
+                        final = start + TEXT_BLOCK_SIZE >= size
+                        # Held-back text has no line break past its first character, so
+                        # only the new text (and a "\n\n" straddling it) is searched.
+                        new_from = max(len(pending) - 1, 1)
+                        pending += decoder.decode(
+                            mm[start : start + TEXT_BLOCK_SIZE], final=final
+                        )
+
+                        if final:
+                            cut = len(pending)
+                        else:
+                            # Keep paragraphs intact across block boundaries.
+                            cut = pending.rfind("\n\n", new_from)
+                            if cut == -1:
+                                cut = pending.rfind("\n", new_from)
+                            if cut == -1:
+                                if len(pending) < TEXT_SEGMENT_MAX_CHARS:
+                                    continue
+                                # No line breaks at all: cut between words, or hard-cut.
+                                cut = max(
+                                    pending.rfind(" ", new_from), pending.rfind("\t", new_from)
+                                )
+                                if cut <= 0:
+                                    cut = len(pending)
+
+                        segment, pending = pending[:cut], pending[cut:]
+                        if segment:
+                            yield from _clean_documents(
+                                [Document(page_content=segment, metadata={"source": source})]
+                            )
+        except (OSError, ValueError) as exc:
             raise RuntimeError(
                 f"Failed to load text document(s) from file: {file_path!r}"
             ) from exc
 
+    def load_from_urls(self, urls: Sequence[str]) -> List[Document]:
+        """Load documents from several URLs in a single batch.
+
+        All pages are fetched concurrently on one event loop, so the
+        connection setup is shared instead of paid once per URL.
+
+        Args:
+            urls: HTTP or HTTPS URLs to load the document(s) from.
+
+        Returns:
+            A list of loaded `Document` instances, one per URL, in input order.
+            Pages that fail to download produce a document with empty content.
+
+        Raises:
+            ValueError: If any URL is empty or uses an unsupported scheme.
+            RuntimeError: If loading the document(s) fails.
+        """
+        for url in urls:
+            self._validate_url(url)
+
+        if not urls:
+            return []
+
+        # A failed page yields an empty document instead of aborting the batch.
+        loader = WebBaseLoader(list(urls), continue_on_failure=True, **_WEB_LOADER_KWARGS)
+
+        async def _aload() -> List[Document]:
+            return [doc async for doc in loader.alazy_load()]
+
+        try:
+            return _clean_documents(_run_coroutine(_aload()))
+        except Exception as exc:
+            raise RuntimeError(f"Failed to load documents from URLs: {list(urls)!r}") from exc
+
     def load_documents(self, sources: Sequence[Union[str, Path]]) -> List[Document]:
         """Load all documents from the provided sources.
 
@@ -143,13 +569,38 @@ class DocumentProcessor:
                 or the source type is unsupported.
             RuntimeError: Propagated from the underlying loader methods if they fail.
         """
-        
+        return list(self.iter_documents(sources))
+
+    def iter_documents(self, sources: Sequence[Union[str, Path]]) -> Iterator[Document]:
+        """Lazily load all documents from the provided sources.
+
+        URLs are fetched together in one background batch while text files
+        and PDF directories are streamed segment by segment and file by file,
+        with up to `LOCAL_SOURCE_PREFETCH` of them read concurrently.
+        Documents are yielded in the order of `sources`. Sources are
+        validated eagerly, before the iterator is returned.
+
+        Args:
+            sources: Iterable of URLs, file paths, or directory paths.
+
+        Returns:
+            An iterator over loaded `Document` instances.
+
+        Raises:
+            ValueError: If `sources` is empty, or a path does not exist,
+                or the source type is unsupported.
+            RuntimeError: Propagated from the underlying loader methods if they fail.
+        """
+
         if not sources:
             raise ValueError("Parameter 'sources' must be a non-empty sequence.")
 
-        docs: List[Document] = []
+        # Classify every source up front so invalid input fails before any I/O.
+        url_sources: List[Tuple[int, str]] = []
+        txt_sources: List[Tuple[int, Path]] = []
+        pdf_dir_sources: List[Tuple[int, Path]] = []
 
-        for source in sources:
+        for index, source in enumerate(sources):
             if not source:
                 continue
 
@@ -157,34 +608,86 @@ class DocumentProcessor:
 
             # URL case
             if source_str.startswith(("http://", "https://")):
-                loaded_docs = self.load_from_url(source_str)
-                if loaded_docs:
-                    docs.extend(loaded_docs)
-                continue  
+                url_sources.append((index, source_str))
+                continue
 
-        
             path = Path(source)
 
             if not path.exists():
                 raise ValueError(f"Source path does not exist: {path}")
 
             if path.is_dir():
-                loaded_docs = self.load_from_pdf_dir(path)
-                if loaded_docs:
-                    docs.extend(loaded_docs)
+                pdf_dir_sources.append((index, path))
             else:
                 suffix = path.suffix.lower()
 
                 if suffix == ".txt":
-                    loaded_docs = self.load_from_txt(path)
-                    if loaded_docs:
-                        docs.extend(loaded_docs)
+                    txt_sources.append((index, path))
                 else:
                     raise ValueError(
                         f"Unsupported file type: {suffix} (source: {path})"
                     )
 
-        return docs
+        return self._iter_sources(url_sources, txt_sources, pdf_dir_sources)
+
+    def _iter_sources(
+        self,
+        url_sources: List[Tuple[int, str]],
+        txt_sources: List[Tuple[int, Path]],
+        pdf_dir_sources: List[Tuple[int, Path]],
+    ) -> Iterator[Document]:
+        """Yield documents from classified sources in source order.
+
+        The URL batch is fetched in the background, and up to
+        `LOCAL_SOURCE_PREFETCH` upcoming text files and PDF directories are
+        read concurrently, each streamed through a bounded buffer.
+        """
+        local_sources: Dict[int, Callable[[], Iterator[Document]]] = {
+            index: partial(self.iter_txt_docs, path) for index, path in txt_sources
+        }
+        local_sources.update(
+            (index, partial(self.iter_pdf_docs, path)) for index, path in pdf_dir_sources
+        )
+        url_indices = [index for index, _ in url_sources]
+        order = sorted(local_sources.keys() | set(url_indices))
+
+        with ExitStack() as stack:
+            executor = stack.enter_context(
+                ThreadPoolExecutor(max_workers=LOCAL_SOURCE_PREFETCH + 1)
+            )
+
+            url_future: Optional[Future] = None
+            if url_sources:
+                # Fetch pages in the background while local files are read.
+                urls = [url for _, url in url_sources]
+                url_future = executor.submit(self.load_from_urls, urls)
+
+            prefetched: Dict[int, _SourcePrefetcher] = {}
+            # Stop readers that are still running if the consumer stops early.
+            stack.callback(lambda: [reader.stop() for reader in prefetched.values()])
+            upcoming = iter(index for index in order if index in local_sources)
+
+            def read_ahead() -> None:
+                while len(prefetched) < LOCAL_SOURCE_PREFETCH:
+                    index = next(upcoming, None)
+                    if index is None:
+                        return
+                    prefetched[index] = _SourcePrefetcher(executor, local_sources[index])
+
+            url_docs: Optional[Dict[int, Document]] = None
+
+            for index in order:
+                read_ahead()
+                if index in local_sources:
+                    yield from prefetched[index]
+                    del prefetched[index]
+                    continue
+
+                if url_docs is None:
+                    # WebBaseLoader yields exactly one document per URL.
+                    url_docs = dict(zip(url_indices, url_future.result()))
+                if index in url_docs:
+                    yield url_docs.pop(index)
 
     def split_documents(self, documents: List[Document]) -> List[Document]:
         """Split documents into chunks.
@@ -198,7 +701,26 @@ class DocumentProcessor:
         if not documents:
             return []
 
-        return self.splitter.split_documents(documents)
+        key = (_documents_digest(documents), self.chunk_size, self.chunk_overlap)
+        cached = _split_cache.get(key)
+        if cached is not None:
+            return cached
+
+        chunks = self.splitter.split_documents(documents)
+        _split_cache.put(key, chunks)
+        return chunks
+
+    def split_documents_stream(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """Lazily split documents into chunks, one document at a time.
+
+        Args:
+            documents: Iterable of documents to be chunked.
+
+        Returns:
+            An iterator over chunked `Document` instances.
+        """
+        for doc in documents:
+            yield from self.splitter.split_documents([doc])
 
     def process_url(self, urls: List[str]) -> List[Document]:
         """Complete pipeline to load and split documents from URLs.
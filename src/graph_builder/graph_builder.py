@@ -1,9 +1,30 @@
 """ Graph builder for LangGraph Workflow"""
 
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import faiss
+import numpy as np
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import START, END , StateGraph
 from src.state.state import RAGState
 from src.nodes.reactnode import RAGNodes
 
+# number of answered queries remembered
+RESPONSE_CACHE_SIZE = 1024
+# cosine similarity above which a past query counts as the same question
+SEMANTIC_CACHE_THRESHOLD = 0.97
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize_query(query: str) -> str:
+    """ Normalize case and whitespace so trivially different queries share a cache entry """
+    return _WHITESPACE.sub(" ", query.strip().lower())
+
+
 class GraphBuilder:
     """ Builds and Orchestrates the langgraph workflow"""
     
@@ -16,10 +37,36 @@ class GraphBuilder:
         """
         self.nodes= RAGNodes(retriever= retriever, llm=llm)
         self.graph= None
+        self._build_lock = threading.Lock()
+        
+        # response cache: exact lookups on the normalized query, plus a small
+        # inner-product index of past query embeddings for near-duplicates
+        vectorstore = getattr(retriever, "vectorstore", None)
+        self._embeddings = getattr(vectorstore, "embeddings", None)
+        self._responses: "OrderedDict[str, dict]" = OrderedDict()
+        self._semantic_index: Optional[faiss.IndexFlatIP] = None
+        self._semantic_answers: List[dict] = []
+        self._cache_lock = threading.Lock()
+        
+        # retriever and llm are known up front, so compile once here
+        self.build()
     
     def build(self):
         """
-        Builds the rag workflow graph
+        Builds the rag workflow graph, compiling it only once
+        
+        Returns: 
+            Compiled graph instance
+            
+        """
+        with self._build_lock:
+            if self.graph is None:
+                self.graph = self._compile()
+        return self.graph
+    
+    def _compile(self):
+        """
+        Compiles the rag workflow graph
         
         Returns: 
             Compiled graph instance
@@ -28,8 +75,12 @@ class GraphBuilder:
         builder = StateGraph(RAGState)
         
         # adding nodes
-        builder.add_node("retriever", self.nodes.retrieve_docs)
-        builder.add_node("retriever", self.nodes.generate_answer)
+        # sync and async variants so both invoke() and ainvoke() work
+        builder.add_node(
+            "retriever",
+            RunnableLambda(self.nodes.retrieve_docs, afunc=self.nodes.aretrieve_docs),
+        )
+        builder.add_node("responder", self.nodes.generate_answer)
         
         builder.set_entry_point("retriever")
         
@@ -37,13 +88,41 @@ class GraphBuilder:
         builder.add_edge("responder", END)
         
         # compile graph 
-        self.graph = builder.compile()
-        return self.graph
+        return builder.compile()
         
         
     
     def run(self, query:str) -> dict:
-        """ Run the rag workflow
+        """ Run the rag workflow, reusing the answer to a repeated query
+
+        Args:
+            query (str): user query
+
+        Returns:
+            dict: Final state with answer
+            
+        """
+        norm_query = _normalize_query(query)
+        cached = self._lookup_exact(query, norm_query)
+        if cached is not None:
+            return cached
+        
+        embedding = vector = None
+        if self._embeddings is not None:
+            embedding = self._embeddings.embed_query(query)
+            vector = self._unit_vector(embedding)
+            cached = self._lookup_semantic(query, norm_query, vector)
+            if cached is not None:
+                return cached
+        
+        # hand the embedding to the retriever node so the query is embedded once
+        intial_state= RAGState(query=query, query_embedding=embedding)
+        result = self.graph.invoke(intial_state)
+        self._store(norm_query, vector, result)
+        return self._copy_result(query, result)
+
+    async def arun(self, query:str) -> dict:
+        """ Run the rag workflow asynchronously, reusing the answer to a repeated query
 
         Args:
             query (str): user query
@@ -52,8 +131,88 @@ class GraphBuilder:
             dict: Final state with answer
             
         """
-        if self.graph is None: 
-            self.build()
+        norm_query = _normalize_query(query)
+        cached = self._lookup_exact(query, norm_query)
+        if cached is not None:
+            return cached
+        
+        embedding = vector = None
+        if self._embeddings is not None:
+            embedding = await self._embeddings.aembed_query(query)
+            vector = self._unit_vector(embedding)
+            cached = self._lookup_semantic(query, norm_query, vector)
+            if cached is not None:
+                return cached
         
-        intial_state= RAGState(query=query)
-        return self.graph.invoke(intial_state)
\ No newline at end of file
+        # hand the embedding to the retriever node so the query is embedded once
+        intial_state= RAGState(query=query, query_embedding=embedding)
+        result = await self.graph.ainvoke(intial_state)
+        self._store(norm_query, vector, result)
+        return self._copy_result(query, result)
+    
+    @staticmethod
+    def _unit_vector(embedding: List[float]) -> np.ndarray:
+        """ Convert an embedding into a normalized (1, d) float32 row for the IP index """
+        vector = np.asarray([embedding], dtype=np.float32)
+        faiss.normalize_L2(vector)
+        return vector
+    
+    @staticmethod
+    def _copy_result(query: str, result: dict) -> dict:
+        """ Copy a cached final state for a caller, under the caller's own query
+
+        The document list and documents are copied too, so mutating the returned
+        state cannot change what later callers get from the cache
+        """
+        copied = dict(result)
+        copied["query"] = query
+        copied["retrieved_docs"] = [
+            doc.model_copy(deep=True) for doc in result.get("retrieved_docs", [])
+        ]
+        return copied
+    
+    def _lookup_exact(self, query: str, norm_query: str) -> Optional[dict]:
+        """ Return a copy of the cached final state for an identical query, if any """
+        with self._cache_lock:
+            result = self._responses.get(norm_query)
+            if result is None:
+                return None
+            self._responses.move_to_end(norm_query)
+        return self._copy_result(query, result)
+    
+    def _lookup_semantic(
+        self, query: str, norm_query: str, vector: np.ndarray
+    ) -> Optional[dict]:
+        """ Return a copy of the cached final state for a near-identical query, if any """
+        with self._cache_lock:
+            if self._semantic_index is None or self._semantic_index.ntotal == 0:
+                return None
+            scores, ids = self._semantic_index.search(vector, 1)
+            if scores[0][0] < SEMANTIC_CACHE_THRESHOLD:
+                return None
+            result = self._semantic_answers[ids[0][0]]
+            self._responses[norm_query] = result
+            self._evict()
+        return self._copy_result(query, result)
+    
+    def _store(self, norm_query: str, vector: Optional[np.ndarray], result: dict) -> None:
+        """ Remember the final state for a query and its embedding """
+        with self._cache_lock:
+            self._responses[norm_query] = result
+            self._evict()
+            
+            if vector is None:
+                return
+            if self._semantic_index is None:
+                self._semantic_index = faiss.IndexFlatIP(vector.shape[1])
+            if self._semantic_index.ntotal >= RESPONSE_CACHE_SIZE:
+                # drop the oldest embedding; later ids shift down by one
+                self._semantic_index.remove_ids(np.array([0], dtype=np.int64))
+                self._semantic_answers.pop(0)
+            self._semantic_index.add(vector)
+            self._semantic_answers.append(result)
+    
+    def _evict(self) -> None:
+        """ Drop least recently used answers beyond the cache size; caller holds the lock """
+        while len(self._responses) > RESPONSE_CACHE_SIZE:
+            self._responses.popitem(last=False)
@@ -1,7 +1,57 @@
 """LangGraph Nodes for the Rag Workflow  """
 
+from functools import lru_cache
+from typing import List
+
+import tiktoken
+from langchain_core.documents import Document
+
 from src.state.state import RAGState
 
+# token budget for retrieved context in the answer prompt
+MAX_CONTEXT_TOKENS = 8000
+
+PROMPT_TEMPLATE = """
+        Answer the query based on the context provided
+        
+        Context: 
+            {context}
+            
+        query: {query}
+        
+        """
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> tiktoken.Encoding:
+    """ Tokenizer used to measure the context budget """
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _build_context(docs: List[Document], max_tokens: int = MAX_CONTEXT_TOKENS) -> str:
+    """ Join document contents, truncating once the token budget is spent
+
+    Args:
+        docs (List[Document]): retrieved documents in rank order
+        max_tokens (int): maximum number of context tokens
+
+    Returns:
+        str: context for the prompt
+    """
+    encoding = _encoding()
+    parts = []
+    remaining = max_tokens
+    for doc in docs:
+        tokens = encoding.encode_ordinary(doc.page_content)
+        if len(tokens) > remaining:
+            if remaining > 0:
+                parts.append(encoding.decode(tokens[:remaining]))
+            break
+        parts.append(doc.page_content)
+        remaining -= len(tokens)
+    return "\n\n".join(parts)
+
+
 class RAGNodes: 
     def __init__(self, llm , retriever):
         """ Initailizes RAG nodes 
@@ -23,10 +73,7 @@ class RAGNodes:
             
         """
         docs = self.retriever.invoke(state.query)
-        return RAGState(
-            query = state.query, 
-            retrieved_docs= docs            
-        )
+        return state.model_copy(update={"retrieved_docs": docs})
     
     def generate_answer(self, state: RAGState) -> RAGState: 
         """ Genrate response form retrieved 
@@ -38,21 +85,9 @@ class RAGNodes:
             RAGState: Updated state of the RAG workflow graph
         """
         
-        context = "/n/n".join([doc.page_content for doc in state.retrieved_docs])
-        prompt = f"""
-        Answer the query based on the context provided
-        
-        Context: 
-            {context}
-            
-        query: {state.query}
-        
-        """
+        context = _build_context(state.retrieved_docs)
+        prompt = PROMPT_TEMPLATE.format_map({"context": context, "query": state.query})
         response= self.llm.invoke(prompt)
-        return RAGState(
-            query= state.query,
-            retrieved_docs= state.documents, 
-            response= response.content
-        )
+        return state.model_copy(update={"response": response.content})
         
         
\ No newline at end of file
@@ -1,6 +1,11 @@
+import asyncio
+from functools import lru_cache
 from typing import List, Optional
 from src.state.state import RAGState
 
+import requests
+from requests.adapters import HTTPAdapter
+
 from langchain_core.documents import Document
 from langchain_core.tools import Tool
 from langchain_core.messages import HumanMessage
@@ -8,6 +13,33 @@ from langchain.agents import create_agent
 
 from langchain_community.utilities import WikipediaAPIWrapper
 from langchain_community.tools.wikipedia.tool import WikipediaQueryRun
+from langchain_community.vectorstores import FAISS
+
+from src.vectorstore.vectorstore import QueryBatcher
+
+
+@lru_cache(maxsize=1)
+def _wikipedia_tool() -> Tool:
+    """Build the Wikipedia tool once and share it across all agents.
+
+    The `wikipedia` client calls `requests.get` directly, which opens a new
+    connection per call; pointing it at a pooled session keeps connections
+    to the Wikipedia API alive between searches.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    api_wrapper = WikipediaAPIWrapper(top_k_results=3, lang="en")
+    api_wrapper.wiki_client.wikipedia.requests = session
+
+    wiki = WikipediaQueryRun(api_wrapper=api_wrapper)
+    return Tool(
+        name="wikipedia",
+        description="Search Wikipedia for general knowledge.",
+        func=wiki.run,
+    )
 
 
 class RAGNodes:
@@ -24,25 +56,47 @@ class RAGNodes:
         self.llm = llm
         self._agent = None  # lazy initialization of agent
 
+        # Tool calls from concurrent agent steps share embedding + search calls.
+        vectorstore = getattr(retriever, "vectorstore", None)
+        batchable = (
+            isinstance(vectorstore, FAISS)
+            and getattr(retriever, "search_type", None) == "similarity"
+        )
+        self._batcher: Optional[QueryBatcher] = (
+            QueryBatcher(vectorstore) if batchable else None
+        )
+        # Lets retrieval search by a query embedding the caller already has.
+        self._vectorstore: Optional[FAISS] = vectorstore if batchable else None
+
     # ---- LangGraph node: retrieval ----
     def retrieve_docs(self, state: RAGState) -> RAGState:
         """Retrieve documents and update state."""
-        docs: List[Document] = self.retriever.invoke(state.query)
-
-        return RAGState(
-            query=state.query,
-            retrieved_docs=docs,
-            response=state.response,
-        )
+        if state.query_embedding is not None and self._vectorstore is not None:
+            docs: List[Document] = self._vectorstore.similarity_search_by_vector(
+                state.query_embedding, **self.retriever.search_kwargs
+            )
+        else:
+            docs = self.retriever.invoke(state.query)
+
+        # The embedding is consumed here; keep it out of the final (cached) state.
+        return state.model_copy(update={"retrieved_docs": docs, "query_embedding": None})
+
+    async def aretrieve_docs(self, state: RAGState) -> RAGState:
+        """Asynchronously retrieve documents and update state."""
+        if state.query_embedding is not None and self._vectorstore is not None:
+            docs: List[Document] = await self._vectorstore.asimilarity_search_by_vector(
+                state.query_embedding, **self.retriever.search_kwargs
+            )
+        else:
+            docs = await self.retriever.ainvoke(state.query)
+
+        return state.model_copy(update={"retrieved_docs": docs, "query_embedding": None})
 
     # ---- Tools for the agent ----
     def _build_tools(self) -> List[Tool]:
         """Build retriever + Wikipedia tools."""
 
-        def retriever_tool_fn(query: str) -> str:
-            """Fetch relevant passages from the indexed vectorstore."""
-            docs: List[Document] = self.retriever.invoke(query)
-
+        def format_docs(docs: List[Document]) -> str:
             if not docs:
                 return "No documents found."
 
@@ -54,22 +108,29 @@ class RAGNodes:
 
             return "\n\n".join(merged_chunks)
 
+        def retriever_tool_fn(query: str) -> str:
+            """Fetch relevant passages from the indexed vectorstore."""
+            if self._batcher is None:
+                return format_docs(self.retriever.invoke(query))
+
+            k = self.retriever.search_kwargs.get("k", 4)
+            return format_docs(self._batcher.search(query, k))
+
+        async def aretriever_tool_fn(query: str) -> str:
+            """Asynchronously fetch relevant passages from the indexed vectorstore."""
+            if self._batcher is None:
+                return format_docs(await self.retriever.ainvoke(query))
+
+            return await asyncio.to_thread(retriever_tool_fn, query)
+
         retriever_tool = Tool(
             name="retriever",
             func=retriever_tool_fn,
+            coroutine=aretriever_tool_fn,
             description="Fetch passages from the indexed vector store.",
         )
 
-        wiki = WikipediaQueryRun(
-            api_wrapper=WikipediaAPIWrapper(top_k_results=3, lang="en")
-        )
-        wikipedia_tool = Tool(
-            name="wikipedia",
-            description="Search Wikipedia for general knowledge.",
-            func=wiki.run,
-        )
-
-        return [retriever_tool, wikipedia_tool]
+        return [retriever_tool, _wikipedia_tool()]
 
     # ---- Build the ReAct agent using create_agent ----
     def _build_agent(self) -> None:
@@ -107,8 +168,6 @@ class RAGNodes:
             answer_msg = messages[-1]
             answer = getattr(answer_msg, "content", None)
 
-        return RAGState(
-            query=state.query,
-            retrieved_docs=state.retrieved_docs,
-            response=answer or "Could not generate response.",
+        return state.model_copy(
+            update={"response": answer or "Could not generate response."}
         )
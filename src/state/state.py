@@ -1,11 +1,14 @@
 """ state definition for LangGraph """
 
-from typing import List
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, SkipValidation
 from langchain_core.documents import Document
 
 class RAGState(BaseModel):
     """State object for RAG workflow"""
     query: str
-    retrieved_docs: List[Document] =[]
+    # documents come straight from the retriever; re-validating each one is pure overhead
+    retrieved_docs: SkipValidation[List[Document]] =[]
+    # query embedding computed by the caller, so retrieval does not embed the query again
+    query_embedding: SkipValidation[Optional[List[float]]] = None
     response:str = ""
\ No newline at end of file
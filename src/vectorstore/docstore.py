@@ -0,0 +1,155 @@
+"""Columnar docstore backing the FAISS vector store."""
+
+import json
+from typing import Dict, List, Optional, Sequence, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from langchain_community.docstore.base import AddableMixin, Docstore
+from langchain_core.documents import Document
+
+_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("text", pa.large_string()),
+        ("metadata", pa.large_string()),
+    ]
+)
+
+
+def _to_table(documents: Dict[str, Document]) -> pa.Table:
+    """Convert documents keyed by id into an Arrow table."""
+    return pa.table(
+        [
+            pa.array(list(documents.keys()), type=pa.string()),
+            pa.array(
+                [doc.page_content for doc in documents.values()],
+                type=pa.large_string(),
+            ),
+            pa.array(
+                [json.dumps(doc.metadata, default=str) for doc in documents.values()],
+                type=pa.large_string(),
+            ),
+        ],
+        schema=_SCHEMA,
+    )
+
+
+class ArrowDocstore(Docstore, AddableMixin):
+    """Docstore that keeps texts and metadata in Arrow columns.
+
+    Instead of one `Document` object per vector, page contents and
+    JSON-encoded metadata live in flat Arrow buffers, and documents are
+    materialized only when they are returned from a search. Metadata
+    values that are not JSON-serializable are stored as strings.
+    """
+
+    def __init__(self, documents: Optional[Dict[str, Document]] = None) -> None:
+        """
+        Initialize the ArrowDocstore.
+
+        Args:
+            documents: Optional initial documents keyed by id.
+        """
+        self._table = _to_table(documents or {})
+        self._rows: Dict[str, int] = {id_: i for i, id_ in enumerate(documents or {})}
+
+    def __len__(self) -> int:
+        return self._table.num_rows
+
+    def add(self, texts: Dict[str, Document]) -> None:
+        """
+        Add documents to the docstore.
+
+        Args:
+            texts: Documents keyed by id.
+
+        Raises:
+            ValueError: If any of the ids already exist.
+        """
+        overlapping = set(texts).intersection(self._rows)
+        if overlapping:
+            raise ValueError(f"Tried to add ids that already exist: {overlapping}")
+
+        offset = self._table.num_rows
+        self._table = pa.concat_tables([self._table, _to_table(texts)])
+        self._rows.update({id_: offset + i for i, id_ in enumerate(texts)})
+
+    def compact(self) -> None:
+        """
+        Merge the chunks left behind by successive `add` calls.
+
+        Every `add` appends a chunk, and `take` on a multi-chunk table
+        concatenates whole columns first, so this should be called once
+        a bulk build is done.
+        """
+        self._table = self._table.combine_chunks()
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self.compact()
+
+    def delete(self, ids: List) -> None:
+        """
+        Delete documents from the docstore.
+
+        Args:
+            ids: Ids of the documents to delete.
+
+        Raises:
+            ValueError: If any of the ids do not exist.
+        """
+        missing = set(ids).difference(self._rows)
+        if missing:
+            raise ValueError(f"Tried to delete ids that does not exist: {missing}")
+
+        deleted = pc.is_in(self._table.column("id"), value_set=pa.array(ids, pa.string()))
+        self._table = self._table.filter(pc.invert(deleted))
+        self._rows = {
+            id_: i for i, id_ in enumerate(self._table.column("id").to_pylist())
+        }
+
+    def search(self, search: str) -> Union[str, Document]:
+        """
+        Look up a document by id.
+
+        Args:
+            search: Id of the document.
+
+        Returns:
+            The document, or an error message if it is not found.
+        """
+        row = self._rows.get(search)
+        if row is None:
+            return f"ID {search} not found."
+        return self._take([row])[0]
+
+    def mget(self, ids: Sequence[str]) -> List[Optional[Document]]:
+        """
+        Look up several documents by id with a single gather.
+
+        Args:
+            ids: Ids of the documents.
+
+        Returns:
+            The documents in input order, with None for unknown ids.
+        """
+        rows = [self._rows.get(id_) for id_ in ids]
+        found = self._take([row for row in rows if row is not None])
+        found_iter = iter(found)
+        return [next(found_iter) if row is not None else None for row in rows]
+
+    def _take(self, rows: List[int]) -> List[Document]:
+        """Materialize documents for the given table rows."""
+        if not rows:
+            return []
+
+        subset = self._table.take(pa.array(rows, type=pa.int64()))
+        return [
+            Document(id=id_, page_content=text, metadata=json.loads(metadata))
+            for id_, text, metadata in zip(
+                subset.column("id").to_pylist(),
+                subset.column("text").to_pylist(),
+                subset.column("metadata").to_pylist(),
+            )
+        ]
@@ -1,42 +1,525 @@
 """Vector store module for document embedding and retrieval."""
 
-from typing import List, Optional
+import hashlib
+import json
+import operator
+import os
+import pickle
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
+import faiss
+import numpy as np
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
 from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
 from langchain_openai import OpenAIEmbeddings
 
+from src.vectorstore.docstore import ArrowDocstore
+
+# Texts sent per embeddings request (the OpenAI API accepts up to 2048 inputs).
+EMBEDDING_BATCH_SIZE = 2048
+# Upper bound on embeddings requests in flight at once.
+MAX_CONCURRENT_EMBEDDING_REQUESTS = 8
+# Documents consumed per indexing step; one step saturates the concurrent requests.
+INDEX_BATCH_SIZE = EMBEDDING_BATCH_SIZE * MAX_CONCURRENT_EMBEDDING_REQUESTS
+
+# Corpora below this size keep the exact flat index.
+HNSW_MIN_VECTORS = 10_000
+# IVF4096 needs roughly 39 training points per centroid.
+IVF_NLIST = 4096
+IVF_PQ_MIN_VECTORS = 39 * IVF_NLIST
+IVF_NPROBE = 16
+# Cap on vectors used to train IVF, PQ and scalar quantizers.
+IVF_MAX_TRAINING_VECTORS = 256 * IVF_NLIST
+
+# Scalar quantizers for flat and HNSW indexes, keyed by `VectorStore.quantization`.
+SCALAR_QUANTIZERS = {
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+# Bump when the on-disk layout or index construction changes.
+CACHE_FORMAT_VERSION = 2
+
+# Seconds a query waits for concurrent queries to join its batch.
+QUERY_BATCH_WINDOW = 0.005
+
+# Chunks whose 64-bit SimHashes differ in at most this many bits are near-duplicates.
+NEAR_DUPLICATE_MAX_DISTANCE = 3
+# Words per shingle when computing SimHashes.
+SHINGLE_SIZE = 3
+# By pigeonhole, near-duplicates share at least one of these 16-bit bands exactly.
+_SIMHASH_BANDS = NEAR_DUPLICATE_MAX_DISTANCE + 1
+_SIMHASH_BAND_BITS = 64 // _SIMHASH_BANDS
+
+
+def _gpu_available() -> bool:
+    """Return True if FAISS was built with GPU support and a GPU is visible."""
+    return hasattr(faiss, "StandardGpuResources") and faiss.get_num_gpus() > 0
+
+
+@lru_cache(maxsize=1)
+def _gpu_resources() -> "faiss.StandardGpuResources":
+    """Allocate the GPU scratch memory once and share it across index builds."""
+    return faiss.StandardGpuResources()
+
+
+def _hash64(data: bytes) -> int:
+    """Return a 64-bit hash of `data`."""
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def _simhash(words: List[str]) -> Optional[int]:
+    """Return the 64-bit SimHash of the word shingles, or None if too short."""
+    num_shingles = len(words) - SHINGLE_SIZE + 1
+    if num_shingles <= 0:
+        return None
+
+    hashes = np.fromiter(
+        (
+            _hash64(" ".join(words[i : i + SHINGLE_SIZE]).encode("utf-8", "surrogatepass"))
+            for i in range(num_shingles)
+        ),
+        dtype=np.uint64,
+        count=num_shingles,
+    )
+    bits = np.unpackbits(hashes.view(np.uint8)).reshape(num_shingles, 64)
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > num_shingles
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
+
+
+def _deduplicate(documents: Iterable[Document]) -> Iterator[Document]:
+    """
+    Yield documents, skipping exact and near-duplicate page content.
+
+    Exact duplicates are detected on whitespace-stripped, lowercased text.
+    Near-duplicates are chunks whose SimHash lies within
+    `NEAR_DUPLICATE_MAX_DISTANCE` bits of an earlier chunk. The first
+    occurrence is always kept.
+    """
+    seen_exact: Set[int] = set()
+    bands: List[Dict[int, List[int]]] = [defaultdict(list) for _ in range(_SIMHASH_BANDS)]
+    band_mask = (1 << _SIMHASH_BAND_BITS) - 1
+
+    for doc in documents:
+        normalized = doc.page_content.strip().lower()
+
+        digest = _hash64(normalized.encode("utf-8", "surrogatepass"))
+        if digest in seen_exact:
+            continue
+        seen_exact.add(digest)
+
+        fingerprint = _simhash(normalized.split())
+        if fingerprint is not None:
+            keys = [
+                (fingerprint >> (i * _SIMHASH_BAND_BITS)) & band_mask
+                for i in range(_SIMHASH_BANDS)
+            ]
+            if any(
+                (fingerprint ^ other).bit_count() <= NEAR_DUPLICATE_MAX_DISTANCE
+                for band, key in zip(bands, keys)
+                for other in band.get(key, ())
+            ):
+                continue
+            for band, key in zip(bands, keys):
+                band[key].append(fingerprint)
+
+        yield doc
+
+
+class _ArrowFAISS(FAISS):
+    """FAISS vector store that resolves the hits of a search with one docstore gather.
+
+    The stock implementation calls `docstore.search` once per hit, which
+    on an `ArrowDocstore` costs a one-row `take` each; here all hits go
+    through a single `ArrowDocstore.mget`. Filters and `score_threshold`
+    behave as in `FAISS`.
+    """
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Union[Callable, Dict[str, Any]]] = None,
+        fetch_k: int = 20,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        if not isinstance(self.docstore, ArrowDocstore):
+            return super().similarity_search_with_score_by_vector(
+                embedding, k=k, filter=filter, fetch_k=fetch_k, **kwargs
+            )
+
+        vector = np.array([embedding], dtype=np.float32)
+        if self._normalize_L2:
+            faiss.normalize_L2(vector)
+        scores, indices = self.index.search(vector, k if filter is None else fetch_k)
+
+        # FAISS pads with -1 when fewer than k vectors are available.
+        hits = [
+            (self.index_to_docstore_id[i], score)
+            for i, score in zip(indices[0], scores[0])
+            if i != -1
+        ]
+        filter_func = self._create_filter_func(filter) if filter is not None else None
+
+        docs = []
+        for (id_, score), doc in zip(hits, self.docstore.mget([id_ for id_, _ in hits])):
+            if doc is None:
+                raise ValueError(f"Could not find document for id {id_}, got {doc}")
+            if filter_func is None or filter_func(doc.metadata):
+                docs.append((doc, score))
+
+        score_threshold = kwargs.get("score_threshold")
+        if score_threshold is not None:
+            cmp = (
+                operator.ge
+                if self.distance_strategy
+                in (DistanceStrategy.MAX_INNER_PRODUCT, DistanceStrategy.JACCARD)
+                else operator.le
+            )
+            docs = [(doc, score) for doc, score in docs if cmp(score, score_threshold)]
+        return docs[:k]
+
 
 class VectorStore:
     """Manages a FAISS-based vector store for document retrieval."""
 
-    def __init__(self, embedding_model: Optional[OpenAIEmbeddings] = None) -> None:
+    def __init__(
+        self,
+        embedding_model: Optional[OpenAIEmbeddings] = None,
+        quantization: Optional[str] = "fp16",
+        deduplicate: bool = True,
+        cache_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
         """
         Initialize the VectorStore.
 
         Args:
             embedding_model: Optional custom embeddings instance.
-                             Defaults to `OpenAIEmbeddings()`.
+                             Defaults to a batched `OpenAIEmbeddings`.
+            quantization: Storage format for flat and HNSW index vectors:
+                          "fp16", "int8", or None to keep full fp32 vectors.
+            deduplicate: Whether to drop exact and near-duplicate chunks
+                         before embedding them.
+            cache_dir: Optional directory where built indexes are saved and
+                       reused across runs. Defaults to None, which always
+                       rebuilds and streams the documents.
+
+        Raises:
+            ValueError: If `quantization` is not a supported format.
         """
-        self.embedding = embedding_model or OpenAIEmbeddings()
+        if quantization is not None and quantization not in SCALAR_QUANTIZERS:
+            raise ValueError(
+                f"Unsupported quantization {quantization!r}. "
+                f"Expected one of {sorted(SCALAR_QUANTIZERS)} or None."
+            )
+
+        # Use every core available to this process for FAISS training, adds and
+        # searches, unless the thread count was set explicitly through OpenMP.
+        if "OMP_NUM_THREADS" not in os.environ:
+            faiss.omp_set_num_threads(os.process_cpu_count() or 1)
+
+        self.quantization = quantization
+        self.deduplicate = deduplicate
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.embedding = embedding_model or OpenAIEmbeddings(
+            chunk_size=EMBEDDING_BATCH_SIZE,
+            max_retries=6,
+            request_timeout=60,
+        )
         self.vectorstore: Optional[FAISS] = None
         self.retriever: Optional[BaseRetriever] = None
 
-    def create_retriever(self, documents: List[Document], k: int = 4) -> None:
+    def create_retriever(self, documents: Iterable[Document], k: int = 4) -> None:
         """
         Create a vector store and retriever from documents.
 
+        If a cache directory is configured and holds an index built from the
+        same documents with the same settings, that index is memory-mapped
+        instead of re-embedding the corpus. Otherwise the index is built and
+        saved there. Computing the corpus hash requires reading all
+        documents up front; without a cache directory, documents are
+        streamed.
+
         Args:
-            documents: List of documents to embed and index.
+            documents: Documents to embed and index; a list or any iterable.
             k: Default number of documents to retrieve per query.
         """
-        if not documents:
-            raise ValueError("Cannot create vector store with an empty document list.")
+        if self.cache_dir is None:
+            self._build_vectorstore(documents)
+        else:
+            documents = list(documents)
+            if not documents:
+                raise ValueError("Cannot create vector store with an empty document list.")
+
+            manifest = self._cache_manifest(documents)
+            if not self._load_cached_index(manifest):
+                self._build_vectorstore(documents)
+                self._save_index(manifest)
 
-        self.vectorstore = FAISS.from_documents(documents, self.embedding)
         self.retriever = self.vectorstore.as_retriever(search_kwargs={"k": k})
 
+    def _build_vectorstore(self, documents: Iterable[Document]) -> None:
+        """
+        Embed documents and build the FAISS vector store.
+
+        Documents are consumed in batches of `INDEX_BATCH_SIZE`, so a lazy
+        iterator (e.g. `DocumentProcessor.split_documents_stream`) never has
+        more than one batch of raw documents resident.
+        Repeated boilerplate is skipped before embedding unless
+        deduplication was disabled.
+
+        Args:
+            documents: Documents to embed and index; a list or any iterable.
+        """
+        self.vectorstore = None
+        doc_iter = _deduplicate(documents) if self.deduplicate else iter(documents)
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_EMBEDDING_REQUESTS) as executor:
+            while batch := list(islice(doc_iter, INDEX_BATCH_SIZE)):
+                texts = [doc.page_content for doc in batch]
+                metadatas = [doc.metadata for doc in batch]
+                ids = [doc.id for doc in batch]
+
+                vectors = self._embed_texts(texts, executor)
+                text_embeddings = list(zip(texts, vectors))
+
+                if self.vectorstore is None:
+                    # Texts and metadata go to columnar storage instead of a dict of Documents.
+                    self.vectorstore = _ArrowFAISS(
+                        embedding_function=self.embedding,
+                        index=faiss.IndexFlatL2(vectors.shape[1]),
+                        docstore=ArrowDocstore(),
+                        index_to_docstore_id={},
+                    )
+                self.vectorstore.add_embeddings(
+                    text_embeddings,
+                    metadatas=metadatas,
+                    ids=ids if any(ids) else None,
+                )
+
+        if self.vectorstore is None:
+            raise ValueError("Cannot create vector store with an empty document list.")
+
+        self.vectorstore.docstore.compact()
+
+        # Build the final index from a view of the flat index's storage rather than a
+        # reconstruct_n copy, so the corpus is held in fp32 only once; the flat index
+        # is released when it is replaced. Vectors are re-added in the same order, so
+        # the docstore mapping still holds.
+        flat_index = self.vectorstore.index
+        vectors = faiss.rev_swig_ptr(flat_index.get_xb(), flat_index.ntotal * flat_index.d)
+        index = self._build_index(vectors.reshape(flat_index.ntotal, flat_index.d))
+        if index is not None:
+            self.vectorstore.index = index
+
+    def _cache_manifest(self, documents: List[Document]) -> Dict[str, Any]:
+        """
+        Describe an index build so a cached index is reused only on an exact match.
+
+        Args:
+            documents: Documents the index is built from.
+
+        Returns:
+            The manifest for this corpus and configuration.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for doc in documents:
+            digest.update(doc.page_content.encode("utf-8", "surrogatepass"))
+            digest.update(b"\x00")
+            digest.update(json.dumps(doc.metadata, sort_keys=True, default=str).encode())
+            digest.update(b"\x01")
+
+        return {
+            "format_version": CACHE_FORMAT_VERSION,
+            "embedding_model": getattr(
+                self.embedding, "model", type(self.embedding).__name__
+            ),
+            "quantization": self.quantization,
+            "deduplicate": self.deduplicate,
+            "corpus_hash": digest.hexdigest(),
+        }
+
+    @staticmethod
+    def _cache_name(manifest: Dict[str, Any]) -> str:
+        """
+        Name the cache files after the whole manifest.
+
+        Indexes of the same corpus built with different settings then get
+        separate files instead of overwriting each other.
+        """
+        encoded = json.dumps(manifest, sort_keys=True).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    def _load_cached_index(self, manifest: Dict[str, Any]) -> bool:
+        """
+        Load a previously saved index matching `manifest`, if there is one.
+
+        The FAISS index is memory-mapped, so its vectors stay in the page
+        cache rather than being copied onto the heap: IVF inverted lists
+        via `IO_FLAG_MMAP`, and the codes of flat, scalar-quantized and
+        HNSW indexes via `IO_FLAG_MMAP_IFC`.
+
+        Args:
+            manifest: Manifest of the index to look for.
+
+        Returns:
+            True if a matching index was loaded.
+        """
+        name = self._cache_name(manifest)
+        manifest_path = self.cache_dir / f"{name}.json"
+        if not manifest_path.is_file():
+            return False
+
+        try:
+            saved = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if saved.get("manifest") != manifest:
+                return False
+
+            index = faiss.read_index(
+                str(self.cache_dir / f"{name}.faiss"), saved["io_flags"]
+            )
+            # Written by `FAISS.save_local` in `_save_index`, never from outside.
+            with open(self.cache_dir / f"{name}.pkl", "rb") as f:
+                docstore, index_to_docstore_id = pickle.load(f)
+        except (KeyError, OSError, RuntimeError, ValueError, pickle.UnpicklingError):
+            return False
+
+        self.vectorstore = _ArrowFAISS(
+            embedding_function=self.embedding,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=index_to_docstore_id,
+        )
+        return True
+
+    def _save_index(self, manifest: Dict[str, Any]) -> None:
+        """
+        Save the current index under the cache directory.
+
+        Any previous manifest is removed before the index files are
+        overwritten, and the new manifest is written last, so an interrupted
+        save is never mistaken for a complete one.
+
+        Args:
+            manifest: Manifest describing the current index.
+        """
+        name = self._cache_name(manifest)
+        (self.cache_dir / f"{name}.json").unlink(missing_ok=True)
+        self.vectorstore.save_local(str(self.cache_dir), index_name=name)
+
+        # The two mmap modes are exclusive: IO_FLAG_MMAP_IFC fails on IVF indexes.
+        if faiss.try_extract_index_ivf(self.vectorstore.index) is not None:
+            io_flags = faiss.IO_FLAG_MMAP
+        else:
+            io_flags = faiss.IO_FLAG_MMAP_IFC
+
+        (self.cache_dir / f"{name}.json").write_text(
+            json.dumps({"manifest": manifest, "io_flags": io_flags}, sort_keys=True),
+            encoding="utf-8",
+        )
+
+    def _build_index(self, vectors: np.ndarray) -> Optional[faiss.Index]:
+        """
+        Build an index sized for the corpus.
+
+        Large corpora get an IVF-PQ index, which scans only `IVF_NPROBE`
+        inverted lists per query and stores compressed codes. Mid-sized
+        corpora get an HNSW graph, which needs no training. Small corpora
+        get an exhaustive index. Outside IVF-PQ, vectors are stored with
+        the scalar quantizer selected by `self.quantization`.
+
+        Args:
+            vectors: Embedding matrix of shape (n, d).
+
+        Returns:
+            The populated index, or None if the default flat index should be kept.
+        """
+        n, d = vectors.shape
+
+        if n > IVF_MAX_TRAINING_VECTORS:
+            rng = np.random.default_rng(0)
+            sample = vectors[rng.choice(n, IVF_MAX_TRAINING_VECTORS, replace=False)]
+        else:
+            sample = vectors
+
+        if n >= IVF_PQ_MIN_VECTORS and d % 64 == 0:
+            index = faiss.index_factory(d, f"IVF{IVF_NLIST},PQ64")
+            if _gpu_available():
+                # k-means training and PQ encoding are far faster on the GPU;
+                # the result is copied back so it can be searched and saved on CPU.
+                gpu_index = faiss.index_cpu_to_gpu(_gpu_resources(), 0, index)
+                gpu_index.train(sample)
+                gpu_index.add(vectors)
+                index = faiss.index_gpu_to_cpu(gpu_index)
+            else:
+                index.train(sample)
+                index.add(vectors)
+            faiss.extract_index_ivf(index).nprobe = IVF_NPROBE
+            return index
+
+        qtype = SCALAR_QUANTIZERS.get(self.quantization)
+
+        if n >= HNSW_MIN_VECTORS:
+            if qtype is None:
+                index = faiss.IndexHNSWFlat(d, 32)
+            else:
+                index = faiss.IndexHNSWSQ(d, qtype, 32)
+        elif qtype is not None:
+            index = faiss.IndexScalarQuantizer(d, qtype)
+        else:
+            return None
+
+        if not index.is_trained:
+            index.train(sample)
+        index.add(vectors)
+        return index
+
+    def _embed_texts(self, texts: List[str], executor: ThreadPoolExecutor) -> np.ndarray:
+        """
+        Embed texts in fixed-size batches with bounded request concurrency.
+
+        Batches go through the synchronous `embed_documents` on `executor`.
+        The embeddings' async client stays bound to the event loop that
+        first uses it, so it is left alone for async retrieval instead of
+        being driven from short-lived loops here.
+
+        Args:
+            texts: Texts to embed.
+            executor: Thread pool with one worker per concurrent request.
+
+        Returns:
+            A float32 matrix with one embedding row per text, in input order.
+        """
+        batches = [
+            texts[i : i + EMBEDDING_BATCH_SIZE]
+            for i in range(0, len(texts), EMBEDDING_BATCH_SIZE)
+        ]
+        results = executor.map(self.embedding.embed_documents, batches)
+        return np.asarray(
+            [vector for batch_vectors in results for vector in batch_vectors],
+            dtype=np.float32,
+        )
+
     def get_retriever(self) -> BaseRetriever:
         """
         Get the retriever instance.
@@ -75,3 +558,105 @@ class VectorStore:
 
         self.retriever.search_kwargs["k"] = k
         return self.retriever.get_relevant_documents(query)
+
+
+class _PendingQuery:
+    """A query waiting for its batch to be searched."""
+
+    def __init__(self, query: str, k: int) -> None:
+        self.query = query
+        self.k = k
+        self.done = threading.Event()
+        self.result: List[Document] = []
+        self.error: Optional[BaseException] = None
+
+
+class QueryBatcher:
+    """Coalesces concurrent searches against a FAISS vector store.
+
+    Queries arriving within `window` seconds of each other share a single
+    embeddings request and a single batched `index.search` call.
+    """
+
+    def __init__(self, vectorstore: FAISS, window: float = QUERY_BATCH_WINDOW) -> None:
+        """
+        Initialize the QueryBatcher.
+
+        Args:
+            vectorstore: FAISS vector store to search.
+            window: Seconds to wait for other queries before searching.
+        """
+        self.vectorstore = vectorstore
+        self.window = window
+        self._pending: List[_PendingQuery] = []
+        self._lock = threading.Lock()
+
+    def search(self, query: str, k: int = 4) -> List[Document]:
+        """
+        Retrieve relevant documents for a query, batched with concurrent callers.
+
+        The first caller of a batch waits for the window to elapse, then
+        searches on behalf of every query that joined in the meantime.
+
+        Args:
+            query: Search query string.
+            k: Number of documents to retrieve.
+
+        Returns:
+            List of retrieved documents.
+        """
+        pending = _PendingQuery(query, k)
+        with self._lock:
+            self._pending.append(pending)
+            is_leader = len(self._pending) == 1
+
+        if is_leader:
+            time.sleep(self.window)
+            with self._lock:
+                batch, self._pending = self._pending, []
+            self._run_batch(batch)
+
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _run_batch(self, batch: List[_PendingQuery]) -> None:
+        """Search every query in `batch` and wake up its caller."""
+        try:
+            results = self._search_many(
+                [pending.query for pending in batch],
+                max(pending.k for pending in batch),
+            )
+            for pending, docs in zip(batch, results):
+                pending.result = docs[: pending.k]
+        except BaseException as exc:
+            for pending in batch:
+                pending.error = exc
+        finally:
+            for pending in batch:
+                pending.done.set()
+
+    def _search_many(self, queries: List[str], k: int) -> List[List[Document]]:
+        """Embed `queries` in one request and search them in one FAISS call."""
+        store = self.vectorstore
+        vectors = np.asarray(store.embeddings.embed_documents(queries), dtype=np.float32)
+        if getattr(store, "_normalize_L2", False):
+            faiss.normalize_L2(vectors)
+
+        _, indices = store.index.search(vectors, k)
+
+        # FAISS pads with -1 when fewer than k vectors are available.
+        hit_ids = [
+            [store.index_to_docstore_id[i] for i in row if i != -1] for row in indices
+        ]
+
+        if isinstance(store.docstore, ArrowDocstore):
+            # Gather every hit of the batch from the columnar store at once.
+            flat = iter(store.docstore.mget([id_ for ids in hit_ids for id_ in ids]))
+            found = [[next(flat) for _ in ids] for ids in hit_ids]
+        else:
+            found = [[store.docstore.search(id_) for id_ in ids] for ids in hit_ids]
+
+        return [[doc for doc in docs if isinstance(doc, Document)] for docs in found]
+
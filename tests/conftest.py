@@ -0,0 +1,70 @@
+import base64
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+STUB_EMBEDDING_SIZE = 16
+
+
+def stub_embedding(text: str) -> np.ndarray:
+    """Deterministic unit vector for `text`, as returned by the stub endpoint."""
+    seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+    vector = np.random.default_rng(seed).standard_normal(STUB_EMBEDDING_SIZE)
+    return (vector / np.linalg.norm(vector)).astype(np.float32)
+
+
+class _EmbeddingsHandler(BaseHTTPRequestHandler):
+    # Keep connections alive, as the real API does, so clients reuse pooled connections.
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        self.server.requests.append(len(inputs))
+
+        data = []
+        for i, text in enumerate(inputs):
+            vector = stub_embedding(str(text))
+            if body.get("encoding_format") == "base64":
+                embedding = base64.b64encode(vector.tobytes()).decode()
+            else:
+                embedding = vector.tolist()
+            data.append({"object": "embedding", "index": i, "embedding": embedding})
+
+        payload = json.dumps(
+            {
+                "object": "list",
+                "data": data,
+                "model": body["model"],
+                "usage": {"prompt_tokens": 0, "total_tokens": 0},
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def openai_stub():
+    """Serve an OpenAI-compatible /embeddings endpoint on localhost.
+
+    Yields the base URL; `server.requests` records the batch size of each call.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EmbeddingsHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,31 @@
+import pickle
+
+from langchain_core.documents import Document
+
+from src.vectorstore.docstore import ArrowDocstore
+
+
+def _docstore() -> ArrowDocstore:
+    docstore = ArrowDocstore()
+    for i in range(3):
+        docstore.add({f"id{i}": Document(page_content=f"text {i}", metadata={"i": i})})
+    return docstore
+
+
+def test_compact_merges_chunks_from_add():
+    docstore = _docstore()
+
+    docstore.compact()
+
+    assert docstore._table.column("text").num_chunks == 1
+    assert docstore.search("id2").page_content == "text 2"
+
+
+def test_unpickled_docstore_is_compacted():
+    docstore = pickle.loads(pickle.dumps(_docstore()))
+
+    assert docstore._table.column("text").num_chunks == 1
+    assert [doc and doc.metadata for doc in docstore.mget(["id1", "missing"])] == [
+        {"i": 1},
+        None,
+    ]
@@ -0,0 +1,167 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pymupdf
+import pytest
+import requests
+from langchain_core.documents import Document
+
+from src.document_ingestion import document_processor
+from src.document_ingestion.document_processor import DocumentProcessor, _DocumentCache
+
+PAGE = """
+<html>
+  <head><title>Papertrail</title></head>
+  <body>
+    <h1>Retrieval</h1>
+    <p>Chunks   are   embedded
+    and indexed.</p>
+  </body>
+</html>
+"""
+
+
+class _StubResponse:
+    status_code = 200
+    encoding = "utf-8"
+    apparent_encoding = "utf-8"
+    text = PAGE
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+def test_load_from_url_parses_stubbed_page(monkeypatch):
+    monkeypatch.setattr(
+        requests.Session, "get", lambda self, url, **kwargs: _StubResponse()
+    )
+
+    docs = DocumentProcessor().load_from_url("https://example.com/page")
+
+    assert len(docs) == 1
+    assert docs[0].metadata["source"] == "https://example.com/page"
+    assert docs[0].metadata["title"] == "Papertrail"
+    assert "Retrieval" in docs[0].page_content
+    assert "Chunks are embedded" in docs[0].page_content
+
+
+def test_document_cache_does_not_share_metadata():
+    cache = _DocumentCache()
+    docs = [Document(page_content="text", metadata={"pages": [1]})]
+    cache.put("key", docs)
+
+    docs[0].metadata["pages"].append(2)
+    cache.get("key")[0].metadata["pages"].append(3)
+
+    assert cache.get("key")[0].metadata == {"pages": [1]}
+
+
+def test_document_cache_evicts_by_size():
+    cache = _DocumentCache(max_chars=8)
+    cache.put("a", [Document(page_content="aaaa")])
+    cache.put("b", [Document(page_content="bbbb")])
+    cache.put("c", [Document(page_content="cccc")])
+    cache.put("huge", [Document(page_content="x" * 9)])
+
+    assert cache.get("a") is None
+    assert cache.get("huge") is None
+    assert [doc.page_content for doc in cache.get("b") + cache.get("c")] == ["bbbb", "cccc"]
+
+
+def _write_pdfs(directory, count):
+    for i in range(count):
+        pdf = pymupdf.open()
+        pdf.new_page().insert_text((72, 72), f"Page of file {i}")
+        pdf.save(directory / f"{i:02}.pdf")
+
+
+def test_iter_pdf_docs_bounds_files_in_flight(tmp_path, monkeypatch):
+    _write_pdfs(tmp_path, 6)
+    submitted = []
+
+    class CountingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(args[0])
+            return super().submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr(document_processor.os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(document_processor, "ProcessPoolExecutor", CountingExecutor)
+
+    docs = DocumentProcessor().iter_pdf_docs(tmp_path)
+    first = next(docs)
+
+    assert "file 0" in first.page_content
+    assert len(submitted) == 3
+    assert [doc.page_content for doc in docs] == [f"Page of file {i}" for i in range(1, 6)]
+    assert document_processor._load_cache.get(
+        document_processor._file_cache_key(tmp_path / "00.pdf")
+    ) is None
+
+
+def test_text_segments_decode_characters_split_across_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_processor, "TEXT_BLOCK_SIZE", 5)
+    text = "naïve café\n\nüber 日本語 text\nend — ok"
+    path = tmp_path / "doc.txt"
+    path.write_text(text, encoding="utf-8")
+
+    docs = list(DocumentProcessor().iter_txt_docs(path))
+
+    assert len(docs) > 1
+    assert "".join(doc.page_content for doc in docs) == text
+
+
+def test_text_segments_without_line_breaks_stay_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_processor, "TEXT_BLOCK_SIZE", 8)
+    monkeypatch.setattr(document_processor, "TEXT_SEGMENT_MAX_CHARS", 32)
+    text = "word " * 200
+    path = tmp_path / "doc.txt"
+    path.write_text(text, encoding="utf-8")
+
+    docs = list(DocumentProcessor().iter_txt_docs(path))
+
+    assert max(len(doc.page_content) for doc in docs) <= 32 + 8
+    assert "".join(doc.page_content for doc in docs) == text
+
+
+def _write_texts(directory, count):
+    paths = []
+    for i in range(count):
+        path = directory / f"{i}.txt"
+        path.write_text(f"text file {i}", encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_iter_documents_reads_local_sources_concurrently(tmp_path, monkeypatch):
+    paths = _write_texts(tmp_path, 3)
+    # Each source waits for the others, so sequential reads would time out.
+    barrier = threading.Barrier(3, timeout=5)
+    iter_txt_docs = DocumentProcessor.iter_txt_docs
+
+    def waiting_iter_txt_docs(self, file_path):
+        barrier.wait()
+        yield from iter_txt_docs(self, file_path)
+
+    monkeypatch.setattr(DocumentProcessor, "iter_txt_docs", waiting_iter_txt_docs)
+
+    docs = DocumentProcessor().load_documents([str(path) for path in paths])
+
+    assert [doc.page_content for doc in docs] == ["text file 0", "text file 1", "text file 2"]
+
+
+def test_iter_documents_raises_source_errors_in_order(tmp_path, monkeypatch):
+    paths = _write_texts(tmp_path, 3)
+    iter_txt_docs = DocumentProcessor.iter_txt_docs
+
+    def failing_iter_txt_docs(self, file_path):
+        if file_path == paths[1]:
+            raise RuntimeError("unreadable")
+        yield from iter_txt_docs(self, file_path)
+
+    monkeypatch.setattr(DocumentProcessor, "iter_txt_docs", failing_iter_txt_docs)
+
+    docs = DocumentProcessor().iter_documents([str(path) for path in paths])
+
+    assert next(docs).page_content == "text file 0"
+    with pytest.raises(RuntimeError, match="unreadable"):
+        next(docs)
@@ -0,0 +1,82 @@
+import asyncio
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.graph_builder.graph_builder import GraphBuilder
+from src.nodes.reactnode import RAGNodes
+from src.vectorstore.vectorstore import VectorStore
+
+
+class CountingEmbedding(DeterministicFakeEmbedding):
+    calls: int = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return super().embed_query(text)
+
+    async def aembed_query(self, text):
+        self.calls += 1
+        return super().embed_query(text)
+
+
+def _answer_with_sources(self, state):
+    sources = ",".join(doc.metadata["source"] for doc in state.retrieved_docs)
+    return state.model_copy(update={"response": sources})
+
+
+class TopicEmbedding(DeterministicFakeEmbedding):
+    """Embeds every question about the same topic to the same vector."""
+
+    def embed_query(self, text):
+        return super().embed_query(text.rstrip("?!. "))
+
+
+def _graph_builder(monkeypatch, embedding=None):
+    monkeypatch.setattr(RAGNodes, "generate_answer", _answer_with_sources)
+
+    embedding = embedding or CountingEmbedding(size=32)
+    store = VectorStore(embedding_model=embedding, deduplicate=False)
+    store.create_retriever(
+        [
+            Document(page_content=f"passage number {i}", metadata={"source": f"doc{i}"})
+            for i in range(20)
+        ],
+        k=2,
+    )
+    return GraphBuilder(retriever=store.get_retriever(), llm=None), embedding
+
+
+def test_run_embeds_query_once_on_cache_miss(monkeypatch):
+    builder, embedding = _graph_builder(monkeypatch)
+
+    result = builder.run("passage number 7")
+
+    assert embedding.calls == 1
+    assert result["response"].split(",")[0] == "doc7"
+    assert result["query_embedding"] is None
+
+
+def test_arun_embeds_query_once_on_cache_miss(monkeypatch):
+    builder, embedding = _graph_builder(monkeypatch)
+
+    result = asyncio.run(builder.arun("passage number 3"))
+
+    assert embedding.calls == 1
+    assert result["response"].split(",")[0] == "doc3"
+
+
+def test_cached_answers_are_returned_under_the_callers_query(monkeypatch):
+    builder, _ = _graph_builder(monkeypatch, TopicEmbedding(size=32))
+    first = builder.run("passage number 5")
+
+    first["retrieved_docs"][0].metadata["source"] = "mutated"
+    first["retrieved_docs"].clear()
+    near_duplicate = builder.run("passage number 5?")
+    exact = builder.run("  Passage number 5 ")
+
+    assert near_duplicate["query"] == "passage number 5?"
+    assert exact["query"] == "  Passage number 5 "
+    for result in (near_duplicate, exact):
+        assert result["response"] == first["response"]
+        assert result["retrieved_docs"][0].metadata["source"] == "doc5"
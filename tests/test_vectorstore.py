@@ -0,0 +1,311 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import faiss
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_openai import OpenAIEmbeddings
+
+from src.vectorstore import vectorstore as vectorstore_module
+from src.vectorstore.vectorstore import QueryBatcher, VectorStore
+
+
+def _documents(n):
+    return [
+        Document(page_content=f"document {i} about topic {i * 7919 % 1000}", metadata={"i": i})
+        for i in range(n)
+    ]
+
+
+def _build_ivf_index(self, vectors):
+    index = faiss.index_factory(vectors.shape[1], "IVF4,Flat")
+    index.train(vectors)
+    index.add(vectors)
+    return index
+
+
+def _store(cache_dir):
+    return VectorStore(
+        embedding_model=DeterministicFakeEmbedding(size=64),
+        deduplicate=False,
+        cache_dir=cache_dir,
+    )
+
+
+def _openai_embeddings(server):
+    return OpenAIEmbeddings(
+        base_url=f"http://127.0.0.1:{server.server_port}/v1",
+        api_key="test",
+        check_embedding_ctx_length=False,
+        max_retries=0,
+    )
+
+
+def test_cache_is_opt_in():
+    assert _store(None).cache_dir is None
+    assert VectorStore(embedding_model=DeterministicFakeEmbedding(size=64)).cache_dir is None
+
+
+def test_create_retriever_inside_running_event_loop():
+    store = _store(None)
+
+    async def build():
+        store.create_retriever(_documents(10), k=2)
+
+    asyncio.run(build())
+
+    assert store.vectorstore.index.ntotal == 10
+
+
+def test_async_retrieval_works_after_indexing(openai_stub):
+    store = VectorStore(embedding_model=_openai_embeddings(openai_stub), deduplicate=False)
+    documents = _documents(10)
+
+    async def build():
+        store.create_retriever(documents, k=2)
+
+    asyncio.run(build())
+    # The async client was not tied to a loop that indexing has since closed.
+    docs = asyncio.run(store.retriever.ainvoke(documents[3].page_content))
+
+    assert docs[0].metadata == {"i": 3}
+
+
+def test_create_retriever_indexes_several_batches(openai_stub, monkeypatch):
+    monkeypatch.setattr(vectorstore_module, "INDEX_BATCH_SIZE", 4)
+    monkeypatch.setattr(vectorstore_module, "EMBEDDING_BATCH_SIZE", 2)
+    store = VectorStore(embedding_model=_openai_embeddings(openai_stub), deduplicate=False)
+    documents = _documents(11)
+
+    store.create_retriever(documents, k=1)
+
+    assert sorted(openai_stub.requests) == [1] + [2] * 5
+    assert isinstance(store.vectorstore.index, faiss.IndexScalarQuantizer)
+    for i in (0, 5, 10):
+        (doc,) = store.vectorstore.similarity_search(documents[i].page_content, k=1)
+        assert doc.metadata == {"i": i}
+
+
+@pytest.mark.parametrize("ivf", [False, True])
+def test_cached_index_is_memory_mapped_on_reuse(tmp_path, monkeypatch, ivf):
+    if ivf:
+        monkeypatch.setattr(VectorStore, "_build_index", _build_ivf_index)
+    documents = _documents(50)
+
+    built = _store(tmp_path)
+    built.create_retriever(documents, k=2)
+
+    (manifest_path,) = tmp_path.glob("*.json")
+    io_flags = json.loads(manifest_path.read_text())["io_flags"]
+    assert io_flags == (faiss.IO_FLAG_MMAP if ivf else faiss.IO_FLAG_MMAP_IFC)
+
+    reused = _store(tmp_path)
+    monkeypatch.setattr(
+        reused, "_build_vectorstore", lambda documents: pytest.fail("index was rebuilt")
+    )
+    reused.create_retriever(documents, k=2)
+
+    query = documents[3].page_content
+    assert (
+        reused.vectorstore.similarity_search(query, k=1)[0].metadata
+        == built.vectorstore.similarity_search(query, k=1)[0].metadata
+    )
+
+
+def test_cache_keeps_one_entry_per_configuration(tmp_path, monkeypatch):
+    documents = _documents(20)
+    for quantization in ("fp16", "int8"):
+        VectorStore(
+            embedding_model=DeterministicFakeEmbedding(size=64),
+            quantization=quantization,
+            cache_dir=tmp_path,
+        ).create_retriever(documents)
+
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    for quantization in ("fp16", "int8"):
+        store = VectorStore(
+            embedding_model=DeterministicFakeEmbedding(size=64),
+            quantization=quantization,
+            cache_dir=tmp_path,
+        )
+        monkeypatch.setattr(
+            store, "_build_vectorstore", lambda documents: pytest.fail("index was rebuilt")
+        )
+        store.create_retriever(documents)
+
+
+def test_interrupted_save_does_not_leave_a_stale_manifest(tmp_path, monkeypatch):
+    documents = _documents(20)
+    _store(tmp_path).create_retriever(documents)
+
+    def interrupted_save(self, folder_path, index_name):
+        raise KeyboardInterrupt
+
+    store = _store(tmp_path)
+    monkeypatch.setattr(store, "_load_cached_index", lambda manifest: False)
+    monkeypatch.setattr(vectorstore_module.FAISS, "save_local", interrupted_save)
+    with pytest.raises(KeyboardInterrupt):
+        store.create_retriever(documents)
+
+    assert list(tmp_path.glob("*.json")) == []
+
+
+class RecordingEmbedding(DeterministicFakeEmbedding):
+    batches: list = []
+    fail: bool = False
+
+    def embed_documents(self, texts):
+        self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError("embeddings unavailable")
+        return super().embed_documents(texts)
+
+
+def _batcher(n, window=0.2):
+    embedding = RecordingEmbedding(size=64)
+    store = VectorStore(embedding_model=embedding, deduplicate=False)
+    store.create_retriever(_documents(n))
+    embedding.batches.clear()
+    return QueryBatcher(store.vectorstore, window=window), embedding
+
+
+def _search_concurrently(batcher, requests):
+    barrier = threading.Barrier(len(requests))
+
+    def search(query, k):
+        barrier.wait()
+        return batcher.search(query, k)
+
+    with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+        futures = [executor.submit(search, query, k) for query, k in requests]
+    return futures
+
+
+def test_query_batcher_coalesces_concurrent_searches():
+    batcher, embedding = _batcher(20)
+    documents = _documents(20)
+    requests = [(documents[i].page_content, k) for i, k in ((1, 1), (7, 3), (12, 2))]
+
+    futures = _search_concurrently(batcher, requests)
+
+    assert len(embedding.batches) == 1
+    assert sorted(embedding.batches[0]) == sorted(query for query, _ in requests)
+    for future, (i, k) in zip(futures, ((1, 1), (7, 3), (12, 2))):
+        docs = future.result()
+        assert len(docs) == k
+        assert docs[0].metadata == {"i": i}
+
+
+def test_query_batcher_raises_batch_errors_in_every_caller():
+    batcher, embedding = _batcher(5)
+    embedding.fail = True
+
+    futures = _search_concurrently(batcher, [("first", 2), ("second", 2)])
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="embeddings unavailable"):
+            future.result()
+
+
+@pytest.mark.parametrize("arrow_docstore", [True, False])
+def test_query_batcher_drops_padding_when_k_exceeds_the_corpus(arrow_docstore):
+    if arrow_docstore:
+        batcher, _ = _batcher(3, window=0)
+    else:
+        texts = [doc.page_content for doc in _documents(3)]
+        batcher = QueryBatcher(
+            FAISS.from_texts(texts, DeterministicFakeEmbedding(size=64)), window=0
+        )
+
+    docs = batcher.search(_documents(3)[0].page_content, k=10)
+
+    assert len(docs) == 3
+    assert docs[0].page_content == _documents(3)[0].page_content
+
+
+def _contents(documents):
+    return [doc.page_content for doc in documents]
+
+
+def test_deduplicate_drops_exact_duplicates_ignoring_case_and_padding():
+    documents = [
+        Document(page_content="Terms of use apply."),
+        Document(page_content="  terms of use apply.\n"),
+        Document(page_content="ok"),
+        Document(page_content="OK"),
+    ]
+
+    assert _contents(vectorstore_module._deduplicate(documents)) == [
+        "Terms of use apply.",
+        "ok",
+    ]
+
+
+def test_deduplicate_drops_near_duplicates_and_keeps_distinct_chunks():
+    words = [f"word{i}" for i in range(200)]
+    original = " ".join(words)
+    near_duplicate = " ".join(words[:100] + ["changed"] + words[101:])
+    distinct = " ".join(reversed(words))
+
+    kept = _contents(
+        vectorstore_module._deduplicate(
+            Document(page_content=text) for text in (original, near_duplicate, distinct)
+        )
+    )
+
+    assert kept == [original, distinct]
+
+
+@pytest.mark.parametrize(
+    "flipped_bits, dropped",
+    [
+        # Within the distance, with every band differing except one.
+        ([0, 16, 32], True),
+        # One bit past the distance, so every band differs.
+        ([0, 16, 32, 48], False),
+    ],
+)
+def test_deduplicate_finds_near_duplicates_through_simhash_bands(
+    monkeypatch, flipped_bits, dropped
+):
+    fingerprint = 0x0123_4567_89AB_CDEF
+    other = fingerprint
+    for bit in flipped_bits:
+        other ^= 1 << bit
+    fingerprints = {"first": fingerprint, "second": other}
+    monkeypatch.setattr(vectorstore_module, "_simhash", lambda words: fingerprints[words[0]])
+
+    kept = _contents(
+        vectorstore_module._deduplicate(
+            [Document(page_content="first"), Document(page_content="second")]
+        )
+    )
+
+    assert kept == (["first"] if dropped else ["first", "second"])
+
+
+def test_default_retrieval_gathers_hits_in_one_docstore_call(monkeypatch):
+    store = _store(None)
+    documents = _documents(20)
+    store.create_retriever(documents, k=3)
+    docstore = store.vectorstore.docstore
+    monkeypatch.setattr(
+        docstore, "search", lambda id_: pytest.fail("hit resolved one at a time")
+    )
+    query = documents[4].page_content
+
+    docs = store.retriever.invoke(query)
+    filtered = store.vectorstore.similarity_search(query, k=2, filter={"i": 9})
+    scored = store.vectorstore.similarity_search_with_score(query, k=3)
+    thresholded = store.vectorstore.similarity_search_with_score(
+        query, k=3, score_threshold=scored[1][1]
+    )
+
+    assert len(docs) == 3
+    assert docs[0].metadata == {"i": 4}
+    assert [doc.metadata for doc in filtered] == [{"i": 9}]
+    assert thresholded == scored[:2]